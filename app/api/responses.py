@@ -0,0 +1,30 @@
+from typing import AsyncIterator
+
+import msgspec
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+_struct_encoder = msgspec.json.Encoder()
+
+def model_json_response(model: BaseModel) -> Response:
+    """
+    Serialize a response model straight to JSON bytes.
+    
+    Pydantic's compiled serializer encodes datetimes and nested models
+    natively, skipping FastAPI's jsonable_encoder + json.dumps round trip.
+    The route's response_model still documents the schema.
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+def struct_json_response(struct: msgspec.Struct) -> Response:
+    """Encode a msgspec Struct to JSON bytes in C and wrap it in a response."""
+    return Response(content=_struct_encoder.encode(struct), media_type="application/json")
+
+def ndjson_response(structs: AsyncIterator[msgspec.Struct]) -> StreamingResponse:
+    """Stream msgspec Structs as newline-delimited JSON, one line per item."""
+    async def lines():
+        async for struct in structs:
+            yield _struct_encoder.encode(struct) + b"\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
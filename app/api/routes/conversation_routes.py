@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Depends, Query, Path
+from fastapi import APIRouter, Depends, Query, Path, Response
+from typing import Optional
 
+from app.api.responses import model_json_response
 from app.controllers.conversation_controller import ConversationController
 from app.schemas.conversation import (
     ConversationResponse,
@@ -11,18 +13,18 @@ router = APIRouter(prefix="/api/conversations", tags=["Conversations"])
 @router.get("/user/{user_id}", response_model=PaginatedConversationResponse)
 async def get_user_conversations(
     user_id: int = Path(..., description="ID of the user"),
-    page: int = Query(1, description="Page number"),
-    limit: int = Query(20, description="Number of conversations per page"),
+    before_token: Optional[str] = Query(None, description="Page token returned by the previous page"),
+    limit: int = Query(20, ge=1, le=1000, description="Number of conversations per page"),
     conversation_controller: ConversationController = Depends()
-) -> PaginatedConversationResponse:
+) -> Response:
     """
     Get all conversations for a user with pagination
     """
-    return await conversation_controller.get_user_conversations(
+    return model_json_response(await conversation_controller.get_user_conversations(
         user_id=user_id,
-        page=page,
+        before_token=before_token,
         limit=limit
-    )
+    ))
 
 @router.get("/{conversation_id}", response_model=ConversationResponse)
 async def get_conversation(
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, Query, Path, Body
+from fastapi import APIRouter, Depends, Query, Path, Body, Response
+from fastapi.responses import StreamingResponse
 from typing import Optional
 from datetime import datetime
 
+from app.api.responses import struct_json_response, ndjson_response
 from app.controllers.message_controller import MessageController
 from app.schemas.message import (
     MessageCreate, 
@@ -24,33 +26,45 @@ async def send_message(
 @router.get("/conversation/{conversation_id}", response_model=PaginatedMessageResponse)
 async def get_conversation_messages(
     conversation_id: int = Path(..., description="ID of the conversation"),
-    page: int = Query(1, description="Page number"),
-    limit: int = Query(20, description="Number of messages per page"),
+    before_token: Optional[str] = Query(None, description="Page token returned by the previous page"),
+    limit: int = Query(20, ge=1, le=1000, description="Number of messages per page"),
     message_controller: MessageController = Depends()
-) -> PaginatedMessageResponse:
+) -> Response:
     """
     Get all messages in a conversation with pagination
     """
-    return await message_controller.get_conversation_messages(
+    return struct_json_response(await message_controller.get_conversation_messages(
         conversation_id=conversation_id,
-        page=page,
+        before_token=before_token,
         limit=limit
-    )
+    ))
+
+@router.get("/conversation/{conversation_id}/stream", response_class=StreamingResponse)
+async def stream_conversation_messages(
+    conversation_id: int = Path(..., description="ID of the conversation"),
+    message_controller: MessageController = Depends()
+) -> StreamingResponse:
+    """
+    Stream all messages in a conversation as newline-delimited JSON, newest first
+    """
+    return ndjson_response(await message_controller.stream_conversation_messages(
+        conversation_id=conversation_id
+    ))
 
 @router.get("/conversation/{conversation_id}/before", response_model=PaginatedMessageResponse)
 async def get_messages_before_timestamp(
     conversation_id: int = Path(..., description="ID of the conversation"),
     before_timestamp: datetime = Query(..., description="Get messages before this timestamp"),
-    page: int = Query(1, description="Page number"),
-    limit: int = Query(20, description="Number of messages per page"),
+    before_token: Optional[str] = Query(None, description="Page token returned by the previous page"),
+    limit: int = Query(20, ge=1, le=1000, description="Number of messages per page"),
     message_controller: MessageController = Depends()
-) -> PaginatedMessageResponse:
+) -> Response:
     """
     Get messages in a conversation before a specific timestamp with pagination
     """
-    return await message_controller.get_messages_before_timestamp(
+    return struct_json_response(await message_controller.get_messages_before_timestamp(
         conversation_id=conversation_id,
         before_timestamp=before_timestamp,
-        page=page,
+        before_token=before_token,
         limit=limit
-    ) 
\ No newline at end of file
+    )) 
\ No newline at end of file
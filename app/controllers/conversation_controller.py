@@ -1,7 +1,15 @@
+import logging
+from typing import Optional
 from fastapi import HTTPException, status
 
 from app.schemas.conversation import ConversationResponse, PaginatedConversationResponse
 from app.models.cassandra_models import ConversationModel
+from app.controllers.pagination import paging_state_from_token
+from app.db.cassandra_client import encode_paging_state
+
+logger = logging.getLogger(__name__)
+
+INTERNAL_ERROR_DETAIL = "Internal server error"
 
 class ConversationController:
     """
@@ -12,7 +20,7 @@ class ConversationController:
     async def get_user_conversations(
         self, 
         user_id: int, 
-        page: int = 1, 
+        before_token: Optional[str] = None, 
         limit: int = 20
     ) -> PaginatedConversationResponse:
         """
@@ -20,7 +28,7 @@ class ConversationController:
         
         Args:
             user_id: ID of the user
-            page: Page number
+            before_token: Page token returned by the previous page
             limit: Number of conversations per page
             
         Returns:
@@ -29,37 +37,40 @@ class ConversationController:
         Raises:
             HTTPException: If user not found or access denied
         """
+        paging_state = paging_state_from_token(before_token)
+        
         try:
             # Get conversations for the user
             result = await ConversationModel.get_user_conversations(
                 user_id=user_id,
-                page=page,
+                paging_state=paging_state,
                 limit=limit
             )
-            
-            # Convert results to our response schema
-            conversations = [
-                ConversationResponse(
-                    id=conv["id"],
-                    user1_id=conv["user1_id"],
-                    user2_id=conv["user2_id"],
-                    last_message_at=conv["last_message_at"],
-                    last_message_content=conv["last_message_content"]
-                )
-                for conv in result["data"]
-            ]
-            
-            return PaginatedConversationResponse(
-                total=result["total"],
-                page=result["page"],
-                limit=result["limit"],
-                data=conversations
-            )
-        except Exception as e:
+        except Exception:
+            logger.exception("Failed to retrieve user conversations")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to retrieve user conversations: {str(e)}"
+                detail=INTERNAL_ERROR_DETAIL
+            ) from None
+        
+        # Convert results to our response schema
+        conversations = [
+            ConversationResponse(
+                id=conv["id"],
+                user1_id=conv["user1_id"],
+                user2_id=conv["user2_id"],
+                last_message_at=conv["last_message_at"],
+                last_message_content=conv["last_message_content"]
             )
+            for conv in result["data"]
+        ]
+        
+        return PaginatedConversationResponse(
+            has_more=result["has_more"],
+            limit=result["limit"],
+            next_page_token=encode_paging_state(result["next_paging_state"]),
+            data=conversations
+        )
     
     async def get_conversation(self, conversation_id: int) -> ConversationResponse:
         """
@@ -78,29 +89,28 @@ class ConversationController:
         try:
             # Get conversation details
             conversation = await ConversationModel.get_conversation(conversation_id=conversation_id)
-            
-            if not conversation:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Conversation with ID {conversation_id} not found"
-                )
-            
-            # For the last message details, we need to get the most recent message
-            # This would typically come from the conversations_by_user table
-            # But for simplicity, we'll just set placeholders here
-            # In a real implementation, you'd query for the most recent message
-            
-            return ConversationResponse(
-                id=conversation["id"],
-                user1_id=conversation["user1_id"],
-                user2_id=conversation["user2_id"],
-                last_message_at=conversation["created_at"],  # Placeholder for last message time
-                last_message_content=conversation["last_message_content"]  # Placeholder for last message content
-            )
-        except HTTPException:
-            raise
-        except Exception as e:
+        except Exception:
+            logger.exception("Failed to retrieve conversation")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to retrieve conversation: {str(e)}"
-            )
\ No newline at end of file
+                detail=INTERNAL_ERROR_DETAIL
+            ) from None
+        
+        if not conversation:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Conversation with ID {conversation_id} not found"
+            )
+        
+        # For the last message details, we need to get the most recent message
+        # This would typically come from the conversations_by_user table
+        # But for simplicity, we'll just set placeholders here
+        # In a real implementation, you'd query for the most recent message
+        
+        return ConversationResponse(
+            id=conversation["id"],
+            user1_id=conversation["user1_id"],
+            user2_id=conversation["user2_id"],
+            last_message_at=conversation["created_at"],  # Placeholder for last message time
+            last_message_content=conversation["last_message_content"]  # Placeholder for last message content
+        )
\ No newline at end of file
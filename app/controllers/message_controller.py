@@ -1,9 +1,24 @@
-from typing import Optional
+import logging
+from typing import Optional, Dict, Any, AsyncIterator
 from datetime import datetime
 from fastapi import HTTPException, status
 
-from app.schemas.message import MessageCreate, MessageResponse, PaginatedMessageResponse
+from app.schemas.message import (
+    MessageCreate,
+    MessageResponse,
+    MessageStruct,
+    PaginatedMessageStruct
+)
 from app.models.cassandra_models import MessageModel
+from app.controllers.pagination import (
+    message_id_from_token,
+    message_struct_from_row,
+    message_page_from_result
+)
+
+logger = logging.getLogger(__name__)
+
+INTERNAL_ERROR_DETAIL = "Internal server error"
 
 class MessageController:
     """
@@ -31,34 +46,35 @@ class MessageController:
                 receiver_id=message_data.receiver_id,
                 content=message_data.content
             )
-            
-            # Convert the result to our response schema
-            return MessageResponse(
-                id=message["id"],
-                content=message["content"],
-                sender_id=message["sender_id"],
-                receiver_id=message["receiver_id"],
-                created_at=message["created_at"],
-                conversation_id=message["conversation_id"]
-            )
-        except Exception as e:
+        except Exception:
+            logger.exception("Failed to send message")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to send message: {str(e)}"
-            )
+                detail=INTERNAL_ERROR_DETAIL
+            ) from None
+        
+        # Convert the result to our response schema
+        return MessageResponse(
+            id=message["id"],
+            content=message["content"],
+            sender_id=message["sender_id"],
+            receiver_id=message["receiver_id"],
+            created_at=message["created_at"],
+            conversation_id=message["conversation_id"]
+        )
     
     async def get_conversation_messages(
         self, 
         conversation_id: int, 
-        page: int = 1, 
+        before_token: Optional[str] = None, 
         limit: int = 20
-    ) -> PaginatedMessageResponse:
+    ) -> PaginatedMessageStruct:
         """
         Get all messages in a conversation with pagination
         
         Args:
             conversation_id: ID of the conversation
-            page: Page number
+            before_token: Page token returned by the previous page
             limit: Number of messages per page
             
         Returns:
@@ -67,53 +83,93 @@ class MessageController:
         Raises:
             HTTPException: If conversation not found or access denied
         """
+        before_id = message_id_from_token(before_token)
+        
         try:
             # Get messages for the conversation
             result = await MessageModel.get_conversation_messages(
                 conversation_id=conversation_id,
-                page=page,
+                before_id=before_id,
                 limit=limit
             )
+        except Exception:
+            logger.exception("Failed to retrieve conversation messages")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=INTERNAL_ERROR_DETAIL
+            ) from None
+        
+        return message_page_from_result(result)
+    
+    async def stream_conversation_messages(
+        self,
+        conversation_id: int
+    ) -> AsyncIterator[MessageStruct]:
+        """
+        Stream every message in a conversation, newest first
+        
+        Messages are produced as rows arrive from Cassandra, so memory use does
+        not grow with the size of the conversation. The first page is read
+        before returning, so a failing query is reported as a 500 like on the
+        other endpoints. Once the stream has started the 200 response is
+        already sent, and a later failure is logged and can only cut the
+        stream short.
+        
+        Args:
+            conversation_id: ID of the conversation
             
-            # Convert results to our response schema
-            messages = [
-                MessageResponse(
-                    id=msg["id"],
-                    content=msg["content"],
-                    sender_id=msg["sender_id"],
-                    receiver_id=msg["receiver_id"],
-                    created_at=msg["created_at"],
-                    conversation_id=msg["conversation_id"]
-                )
-                for msg in result["data"]
-            ]
+        Returns:
+            Async iterator over the messages of the conversation
             
-            return PaginatedMessageResponse(
-                total=result["total"],
-                page=result["page"],
-                limit=result["limit"],
-                data=messages
-            )
-        except Exception as e:
+        Raises:
+            HTTPException: If the messages cannot be read
+        """
+        rows = MessageModel.iter_conversation_messages(conversation_id)
+        
+        try:
+            first_row = await anext(rows)
+        except StopAsyncIteration:
+            first_row = None
+        except Exception:
+            logger.exception("Failed to stream conversation messages")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to retrieve conversation messages: {str(e)}"
-            )
+                detail=INTERNAL_ERROR_DETAIL
+            ) from None
+        
+        return self._stream_messages(first_row, rows)
+    
+    @staticmethod
+    async def _stream_messages(
+        first_row: Optional[Dict[str, Any]],
+        rows: AsyncIterator[Dict[str, Any]]
+    ) -> AsyncIterator[MessageStruct]:
+        """Yield the already fetched first row, then the rest of the rows, as messages"""
+        if first_row is None:
+            return
+        
+        yield message_struct_from_row(first_row)
+        try:
+            async for row in rows:
+                yield message_struct_from_row(row)
+        except Exception:
+            logger.exception("Conversation message stream aborted")
+            raise
     
     async def get_messages_before_timestamp(
         self, 
         conversation_id: int, 
         before_timestamp: datetime,
-        page: int = 1, 
+        before_token: Optional[str] = None, 
         limit: int = 20
-    ) -> PaginatedMessageResponse:
+    ) -> PaginatedMessageStruct:
         """
         Get messages in a conversation before a specific timestamp with pagination
         
         Args:
             conversation_id: ID of the conversation
             before_timestamp: Get messages before this timestamp
-            page: Page number
+            before_token: Page token returned by the previous page
             limit: Number of messages per page
             
         Returns:
@@ -122,36 +178,21 @@ class MessageController:
         Raises:
             HTTPException: If conversation not found or access denied
         """
+        before_id = message_id_from_token(before_token)
+        
         try:
             # Get messages for the conversation before the given timestamp
             result = await MessageModel.get_messages_before_timestamp(
                 conversation_id=conversation_id,
                 before_timestamp=before_timestamp,
-                page=page,
+                before_id=before_id,
                 limit=limit
             )
-            
-            # Convert results to our response schema
-            messages = [
-                MessageResponse(
-                    id=msg["id"],
-                    content=msg["content"],
-                    sender_id=msg["sender_id"],
-                    receiver_id=msg["receiver_id"],
-                    created_at=msg["created_at"],
-                    conversation_id=msg["conversation_id"]
-                )
-                for msg in result["data"]
-            ]
-            
-            return PaginatedMessageResponse(
-                total=result["total"],
-                page=result["page"],
-                limit=result["limit"],
-                data=messages
-            )
-        except Exception as e:
+        except Exception:
+            logger.exception("Failed to retrieve messages before timestamp")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to retrieve messages before timestamp: {str(e)}"
-            )
\ No newline at end of file
+                detail=INTERNAL_ERROR_DETAIL
+            ) from None
+        
+        return message_page_from_result(result)
\ No newline at end of file
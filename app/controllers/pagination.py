@@ -0,0 +1,56 @@
+import uuid
+from typing import Optional, Dict, Any
+from fastapi import HTTPException, status
+
+from app.db.cassandra_client import decode_paging_state
+from app.schemas.message import MessageStruct, PaginatedMessageStruct
+
+def paging_state_from_token(before_token: Optional[str]) -> Optional[bytes]:
+    """Decode a client page token, rejecting malformed tokens with a 400."""
+    try:
+        return decode_paging_state(before_token)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid page token"
+        )
+
+def message_id_from_token(before_token: Optional[str]) -> Optional[uuid.UUID]:
+    """Parse a client message page token, rejecting malformed tokens with a 400."""
+    if not before_token:
+        return None
+    try:
+        message_id = uuid.UUID(before_token)
+    except ValueError:
+        message_id = None
+    # Message IDs are TimeUUIDs; Cassandra rejects any other UUID version
+    if message_id is None or message_id.version != 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid page token"
+        )
+    return message_id
+
+def message_struct_from_row(row: Dict[str, Any]) -> MessageStruct:
+    """
+    Build a message struct straight from a driver row.
+    
+    The values are already typed, so msgspec structs (no validation) are enough.
+    """
+    return MessageStruct(
+        id=row["message_id"],
+        content=row["content"],
+        sender_id=row["sender_id"],
+        receiver_id=row["receiver_id"],
+        created_at=row["created_at"],
+        conversation_id=row["conversation_id"]
+    )
+
+def message_page_from_result(result: Dict[str, Any]) -> PaginatedMessageStruct:
+    """Build a message page, with its next page token, from a MessageModel page result."""
+    return PaginatedMessageStruct(
+        has_more=result["has_more"],
+        limit=result["limit"],
+        next_page_token=str(result["next_before_id"]) if result["has_more"] else None,
+        data=[message_struct_from_row(row) for row in result["data"]]
+    )
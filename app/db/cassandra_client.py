@@ -4,16 +4,42 @@ This provides a connection to the Cassandra database.
 """
 import os
 import uuid
-from typing import List, Dict, Any, Optional, Union, Tuple
+import base64
+import asyncio
+from typing import List, Dict, Any, Optional, Union, Tuple, AsyncIterator
 from datetime import datetime
 import logging
 
-from cassandra.cluster import Cluster, Session
+from cassandra.cluster import Cluster, Session, ResultSet
 from cassandra.auth import PlainTextAuthProvider
-from cassandra.query import SimpleStatement, dict_factory
+from cassandra.query import SimpleStatement, Statement, PreparedStatement, dict_factory
 
 logger = logging.getLogger(__name__)
 
+
+def encode_paging_state(paging_state: Optional[bytes]) -> Optional[str]:
+    """Encode a driver paging state as a URL-safe token for API clients."""
+    if paging_state is None:
+        return None
+    return base64.urlsafe_b64encode(paging_state).decode("ascii")
+
+
+def decode_paging_state(token: Optional[str]) -> Optional[bytes]:
+    """
+    Decode an API page token back into a driver paging state.
+    
+    Raises:
+        ValueError: If the token is not valid URL-safe base64 or decodes to nothing
+    """
+    if not token:
+        return None
+    # Strict decoding: urlsafe_b64decode silently drops invalid characters, and
+    # an empty paging state would make the driver restart from the first page
+    paging_state = base64.b64decode(token.encode("ascii"), altchars=b"-_", validate=True)
+    if not paging_state:
+        raise ValueError("Empty paging state")
+    return paging_state
+
 class CassandraClient:
     """Singleton Cassandra client for the application."""
     
@@ -57,12 +83,16 @@ class CassandraClient:
             self.cluster.shutdown()
             logger.info("Cassandra connection closed")
     
-    def execute(self, query: str, params: Union[Tuple, Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    def execute(
+        self,
+        query: Union[str, Statement],
+        params: Union[Tuple, Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Execute a CQL query.
         
         Args:
-            query: The CQL query string
+            query: The CQL query string, or a prepared/batch statement
             params: The parameters for the query as either a tuple or dictionary
             
         Returns:
@@ -72,7 +102,7 @@ class CassandraClient:
             self.connect()
         
         try:
-            statement = SimpleStatement(query)
+            statement = SimpleStatement(query) if isinstance(query, str) else query
             
             # Ensure params is always passed in the correct format
             if params is None:
@@ -85,32 +115,145 @@ class CassandraClient:
             logger.error(f"Query execution failed: {str(e)}")
             raise
     
-    def execute_async(self, query: str, params: Union[Tuple, Dict[str, Any]] = None):
+    async def execute_page(
+        self,
+        query: Union[str, PreparedStatement],
+        params: Union[Tuple, Dict[str, Any]] = None,
+        fetch_size: int = 20,
+        paging_state: Optional[bytes] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[bytes]]:
         """
-        Execute a CQL query asynchronously.
+        Execute a CQL query and fetch a single page of results.
+        
+        Uses the driver's native paging so only `fetch_size` rows are
+        transferred per call, instead of reading and discarding an offset.
         
         Args:
-            query: The CQL query string
+            query: The CQL query string or a prepared statement
             params: The parameters for the query as either a tuple or dictionary
+            fetch_size: Maximum number of rows in the page
+            paging_state: Paging state returned by a previous call, if any
             
         Returns:
-            Async result object
+            Tuple of (rows as dictionaries, paging state for the next page or None)
         """
         if not self.session:
             self.connect()
         
         try:
-            statement = SimpleStatement(query)
-            
-            # Ensure params is always passed in the correct format
-            if params is None:
-                return self.session.execute_async(statement)
+            if isinstance(query, str):
+                statement = SimpleStatement(query, fetch_size=fetch_size)
             else:
-                return self.session.execute_async(statement, params)
+                # Prepared statements carry the fetch size on the bound statement
+                statement = query.bind(params)
+                statement.fetch_size = fetch_size
+                params = None
+            
+            result = await self._await_result(statement, params, paging_state)
+            
+            # Only the current page is returned; iterating the ResultSet would
+            # transparently (and synchronously) fetch the following pages as well
+            return list(result.current_rows), result.paging_state
+        except Exception as e:
+            logger.error(f"Paged query execution failed: {str(e)}")
+            raise
+    
+    async def async_iter(
+        self,
+        query: Union[str, PreparedStatement],
+        params: Union[Tuple, Dict[str, Any]] = None,
+        fetch_size: int = 500
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over all rows of a query, one driver page at a time.
+        
+        The next page is requested while the rows of the current one are
+        consumed, and at most two pages are held in memory.
+        
+        Args:
+            query: The CQL query string or a prepared statement
+            params: The parameters for the query as either a tuple or dictionary
+            fetch_size: Number of rows per page
+            
+        Yields:
+            Rows as dictionaries
+        """
+        next_page = asyncio.ensure_future(self.execute_page(query, params, fetch_size))
+        try:
+            while next_page is not None:
+                rows, paging_state = await next_page
+                next_page = None
+                if paging_state is not None:
+                    next_page = asyncio.ensure_future(
+                        self.execute_page(query, params, fetch_size, paging_state)
+                    )
+                for row in rows:
+                    yield row
+        finally:
+            # The consumer may stop early (e.g. the client disconnected)
+            if next_page is not None:
+                next_page.cancel()
+    
+    async def execute_async(
+        self,
+        query: Union[str, Statement],
+        params: Union[Tuple, Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute a CQL query without blocking the event loop.
+        
+        Args:
+            query: The CQL query string, or a prepared/batch statement
+            params: The parameters for the query as either a tuple or dictionary
+            
+        Returns:
+            List of rows (of the first page) as dictionaries
+        """
+        if not self.session:
+            self.connect()
+        
+        try:
+            statement = SimpleStatement(query) if isinstance(query, str) else query
+            result = await self._await_result(statement, params)
+            return list(result.current_rows)
         except Exception as e:
             logger.error(f"Async query execution failed: {str(e)}")
             raise
     
+    def _await_result(
+        self,
+        statement: Statement,
+        params: Union[Tuple, Dict[str, Any]] = None,
+        paging_state: Optional[bytes] = None
+    ) -> "asyncio.Future[ResultSet]":
+        """
+        Submit a statement and bridge the driver's ResponseFuture to asyncio.
+        
+        The driver completes requests on its own event loop thread, so the
+        callbacks hand the outcome back to the asyncio loop thread-safely.
+        
+        Returns:
+            Asyncio future resolving to the driver ResultSet
+        """
+        loop = asyncio.get_running_loop()
+        aio_future = loop.create_future()
+        response_future = self.session.execute_async(statement, params, paging_state=paging_state)
+        
+        def set_result(_rows):
+            # The ResultSet (with its paging state) is ready once callbacks run
+            if not aio_future.done():
+                aio_future.set_result(response_future.result())
+        
+        def set_exception(exc):
+            if not aio_future.done():
+                aio_future.set_exception(exc)
+        
+        response_future.add_callbacks(
+            lambda rows: loop.call_soon_threadsafe(set_result, rows),
+            lambda exc: loop.call_soon_threadsafe(set_exception, exc)
+        )
+        return aio_future
+    
     def get_session(self) -> Session:
         """Get the Cassandra session."""
         if not self.session:
@@ -8,6 +8,7 @@ from app.api.routes import message_router, conversation_router
 from app.controllers.message_controller import MessageController
 from app.controllers.conversation_controller import ConversationController
 from app.db.cassandra_client import cassandra_client
+from app.models.cassandra_models import prepare_statements
 
 # Configure logging
 logging.basicConfig(
@@ -63,6 +64,15 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Failed to connect to Cassandra: {str(e)}")
         sys.exit(1)
+    
+    try:
+        # Prepare the model statements before serving requests, so no request
+        # blocks the event loop on the prepare round trips
+        prepare_statements()
+        logger.info("Cassandra statements prepared")
+    except Exception as e:
+        logger.error(f"Failed to prepare Cassandra statements: {str(e)}")
+        sys.exit(1)
 
 @app.on_event("shutdown")
 async def shutdown_event():
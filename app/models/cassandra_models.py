@@ -3,12 +3,24 @@ Models for interacting with Cassandra tables.
 """
 import uuid
 import time
+import asyncio
 import random
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from types import SimpleNamespace
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
+
+from cassandra.query import BatchStatement, BatchType
+from cassandra.util import uuid_from_time
 
 from app.db.cassandra_client import cassandra_client
 
+# Conversations already resolved by this process, keyed by the sorted user ID
+# pair. Sends in an active conversation are then served without a lookup.
+# Bounded as an LRU to cap memory.
+CONVERSATION_CACHE_SIZE = 100_000
+_conversation_cache: "OrderedDict[Tuple[int, int], Dict[str, Any]]" = OrderedDict()
+
 class MessageModel:
     """
     Message model for interacting with the messages table.
@@ -27,10 +39,6 @@ class MessageModel:
         Returns:
             Dictionary with message details
         """
-        # Generate a TimeUUID for the message (provides both unique ID and timestamp)
-        message_id = uuid.uuid1()
-        created_at = datetime.now()  # Use current time for created_at
-        
         # Get or create conversation
         conversation = await ConversationModel.create_or_get_conversation(
             user1_id=sender_id,
@@ -39,45 +47,70 @@ class MessageModel:
         
         conversation_id = conversation["id"]
         
-        # Insert the message into messages table
-        query = """
-            INSERT INTO messages 
-            (conversation_id, message_id, sender_id, receiver_id, content, created_at) 
-            VALUES (%s, %s, %s, %s, %s, %s)
-        """
+        # Every send in this conversation gets the same cached dictionary, even
+        # when they all missed the cache, and nothing below awaits until the
+        # writes are submitted. Concurrent sends therefore read the clock and
+        # claim the last message details strictly one after another. Each send
+        # then deletes the conversations_by_user row of the send claimed just
+        # before it, with a later write timestamp, so the delete wins in
+        # whatever order the writes reach Cassandra.
+        
+        # Read the clock once and derive the TimeUUID from it, so the message ID
+        # (the clustering key) and created_at always agree
+        now = datetime.now()
+        message_id = uuid_from_time(now)
+        # Cassandra stores timestamps with millisecond precision; truncating up
+        # front keeps the cached last_message_at equal to the stored clustering key
+        created_at = now.replace(microsecond=now.microsecond // 1000 * 1000)
+        # Microsecond write time for the conversations_by_user rows
+        write_timestamp = int(now.timestamp() * 1_000_000)
+        
+        previous_message_at = conversation["last_message_at"]
+        conversation["last_message_at"] = created_at
+        conversation["last_message_content"] = content
+        
+        statements = _prepared_statements()
         
-        cassandra_client.execute(query, 
+        # Insert the message into messages table
+        message_write = cassandra_client.execute_async(statements.insert_msg, 
             (conversation_id, message_id, sender_id, receiver_id, content, created_at)
         )
         
-        # Update the conversations table with the latest message details
-        update_conv_query = """
-            UPDATE conversations
-            SET last_message_at = %s, last_message_content = %s
-            WHERE conversation_id = %s
-        """
-        cassandra_client.execute(update_conv_query, 
-            (created_at, content, conversation_id)
-        )
-        
-        # Update conversations_by_user for sender
-        await MessageModel._update_conversation_for_user(
+        # Update the conversations table and both users' conversations_by_user
+        # rows in a single logged batch, so the denormalized views stay in step
+        batch = BatchStatement(batch_type=BatchType.LOGGED)
+        batch.add(statements.update_conv, (created_at, content, conversation_id))
+        MessageModel._add_conversation_for_user(
+            batch,
             user_id=sender_id,
             other_user_id=receiver_id,
-            conversation_id=conversation_id,
+            conversation=conversation,
+            previous_message_at=previous_message_at,
             last_message_at=created_at,
-            last_message_content=content
+            last_message_content=content,
+            write_timestamp=write_timestamp
         )
-        
-        # Update conversations_by_user for receiver
-        await MessageModel._update_conversation_for_user(
+        MessageModel._add_conversation_for_user(
+            batch,
             user_id=receiver_id,
             other_user_id=sender_id,
-            conversation_id=conversation_id,
+            conversation=conversation,
+            previous_message_at=previous_message_at,
             last_message_at=created_at,
-            last_message_content=content
+            last_message_content=content,
+            write_timestamp=write_timestamp
         )
         
+        # Run both writes concurrently and wait for them to complete
+        try:
+            await asyncio.gather(message_write, cassandra_client.execute_async(batch))
+        except Exception:
+            # The batch may or may not have been applied, so the claimed last
+            # message details can no longer be trusted; the next send reloads
+            # the conversation from Cassandra
+            ConversationModel.forget_conversation(sender_id, receiver_id)
+            raise
+        
         # Return the created message with UUID as string
         return {
             "id": str(message_id),  # Convert UUID to string
@@ -89,101 +122,91 @@ class MessageModel:
         }
     
     @staticmethod
-    async def _update_conversation_for_user(
+    def _add_conversation_for_user(
+        batch: BatchStatement,
         user_id: int,
         other_user_id: int,
-        conversation_id: int,
+        conversation: Dict[str, Any],
+        previous_message_at: Optional[datetime],
         last_message_at: datetime,
-        last_message_content: str
+        last_message_content: str,
+        write_timestamp: int
     ) -> None:
         """
-        Update conversation record for a user.
+        Add the conversations_by_user writes for one participant to a batch.
+        
+        Rows are clustered by last_message_at, so the row keyed by the previous
+        last_message_at is deleted and a new row inserted. Both use the same explicit write
+        timestamp, so replaying the batch is idempotent. The conversation
+        participants are denormalized into the row for single-read listings.
         
         Args:
+            batch: Batch to add the statements to
             user_id: ID of the user to update the conversation for
             other_user_id: ID of the other participant in the conversation
-            conversation_id: ID of the conversation
+            conversation: Conversation details as returned by ConversationModel
+            previous_message_at: last_message_at of the row being replaced (None if there is none)
             last_message_at: Timestamp of the last message
             last_message_content: Content of the last message
+            write_timestamp: Write time in microseconds since the epoch
         """
-        query = """
-            INSERT INTO conversations_by_user 
-            (user_id, conversation_id, other_user_id, last_message_at, last_message_content) 
-            VALUES (%s, %s, %s, %s, %s)
-        """
-        
-        # Execute query without await - Cassandra client execute is not actually async
-        cassandra_client.execute(query, 
-            (user_id, conversation_id, other_user_id, last_message_at, last_message_content)
-        )
+        statements = _prepared_statements()
+        
+        if previous_message_at is not None and previous_message_at != last_message_at:
+            batch.add(statements.delete_conv_by_user, (
+                write_timestamp,
+                user_id,
+                previous_message_at,
+                conversation["id"]
+            ))
+        
+        batch.add(statements.upsert_conv_by_user, (
+            user_id,
+            conversation["id"],
+            other_user_id,
+            conversation["user1_id"],
+            conversation["user2_id"],
+            conversation["created_at"],
+            last_message_at,
+            last_message_content,
+            write_timestamp
+        ))
     
     @staticmethod
     async def get_conversation_messages(
         conversation_id: int,
-        page: int = 1,
+        before_id: Optional[uuid.UUID] = None,
         limit: int = 20
     ) -> Dict[str, Any]:
         """
         Get messages for a conversation with pagination.
         
+        Pages continue from the last message_id of the previous page, so each
+        page is a single clustering range read on the conversation partition.
+        
         Args:
             conversation_id: ID of the conversation
-            page: Page number (1-indexed)
+            before_id: Only return messages older than this message ID (None for the first page)
             limit: Maximum number of messages per page
             
         Returns:
-            Dictionary with paginated results
+            Dictionary with paginated results; "data" holds the raw message rows
         """
-        # Calculate pagination offset
-        offset = (page - 1) * limit
+        statements = _prepared_statements()
         
-        # Query for messages
-        query = """
-            SELECT message_id, sender_id, receiver_id, content, created_at, conversation_id 
-            FROM messages 
-            WHERE conversation_id = %s 
-            LIMIT %s
-        """
-        
-        result = cassandra_client.execute(query, (conversation_id, limit + offset))
-        
-        # Apply offset and limit
-        messages = result[offset:offset+limit]
-        
-        # Format messages to match our schema (with string IDs from UUIDs)
-        formatted_messages = []
-        for message in messages:
-            formatted_messages.append({
-                "id": str(message["message_id"]),  # Convert UUID to string
-                "sender_id": message["sender_id"],
-                "receiver_id": message["receiver_id"],
-                "content": message["content"],
-                "created_at": message["created_at"],
-                "conversation_id": message["conversation_id"]
-            })
-            
-        # Count query to get total (note: this is expensive in Cassandra)
-        # In a production app, you might use approximate counts or other strategies
-        count_query = """
-            SELECT COUNT(*) as total
-            FROM messages
-            WHERE conversation_id = %s
-        """
-        count_result = cassandra_client.execute(count_query, (conversation_id,))
-        total = count_result[0]["total"] if count_result else 0
-        
-        return {
-            "total": total,
-            "page": page,
-            "limit": limit,
-            "data": formatted_messages
-        }
+        if before_id is None:
+            return await MessageModel._fetch_message_page(
+                statements.select_msgs, (conversation_id,), limit
+            )
+        return await MessageModel._fetch_message_page(
+            statements.select_msgs_before_id, (conversation_id, before_id), limit
+        )
     
     @staticmethod
     async def get_messages_before_timestamp(
         conversation_id: int,
         before_timestamp: datetime,
-        page: int = 1,
+        before_id: Optional[uuid.UUID] = None,
         limit: int = 20
     ) -> Dict[str, Any]:
         """
@@ -192,58 +215,68 @@ class MessageModel:
         Args:
             conversation_id: ID of the conversation
             before_timestamp: Get messages before this timestamp
-            page: Page number (1-indexed)
+            before_id: Only return messages older than this message ID (None for the first page)
             limit: Maximum number of messages per page
             
         Returns:
-            Dictionary with paginated results
+            Dictionary with paginated results; "data" holds the raw message rows
         """
-        # Calculate pagination offset
-        offset = (page - 1) * limit
+        statements = _prepared_statements()
         
-        # Query for messages before timestamp
-        query = """
-            SELECT message_id, sender_id, receiver_id, content, created_at, conversation_id 
-            FROM messages 
-            WHERE conversation_id = %s AND created_at < %s
-            LIMIT %s
+        if before_id is None:
+            # The timestamp is turned into a TimeUUID bound on the clustering key
+            return await MessageModel._fetch_message_page(
+                statements.select_msgs_before_time, (conversation_id, before_timestamp), limit
+            )
+        # Later pages are already older than before_timestamp
+        return await MessageModel._fetch_message_page(
+            statements.select_msgs_before_id, (conversation_id, before_id), limit
+        )
+    
+    @staticmethod
+    def iter_conversation_messages(conversation_id: int) -> AsyncIterator[Dict[str, Any]]:
         """
+        Iterate over every message in a conversation, newest first.
         
-        result = cassandra_client.execute(query, 
-            (conversation_id, before_timestamp, limit + offset)
-        )
+        Rows are read page by page as the caller consumes them, so the whole
+        conversation is never held in memory.
         
-        # Apply offset and limit
-        messages = result[offset:offset+limit]
-        
-        # Format messages to match our schema (with string IDs from UUIDs)
-        formatted_messages = []
-        for message in messages:
-            formatted_messages.append({
-                "id": str(message["message_id"]),  # Convert UUID to string
-                "sender_id": message["sender_id"],
-                "receiver_id": message["receiver_id"],
-                "content": message["content"],
-                "created_at": message["created_at"],
-                "conversation_id": message["conversation_id"]
-            })
+        Args:
+            conversation_id: ID of the conversation
             
-        # Count query (with timestamp filter)
-        count_query = """
-            SELECT COUNT(*) as total
-            FROM messages
-            WHERE conversation_id = %s AND created_at < %s
+        Returns:
+            Async iterator over the raw message rows
         """
-        count_result = cassandra_client.execute(count_query, 
-            (conversation_id, before_timestamp)
+        return cassandra_client.async_iter(
+            _prepared_statements().select_all_msgs, (conversation_id,)
         )
-        total = count_result[0]["total"] if count_result else 0
+    
+    @staticmethod
+    async def _fetch_message_page(statement, params: Tuple, limit: int) -> Dict[str, Any]:
+        """
+        Fetch one page of messages, newest first.
+        
+        Args:
+            statement: Prepared message query taking LIMIT as its last value
+            params: Values for the query, excluding the limit
+            limit: Maximum number of messages per page
+            
+        Returns:
+            Dictionary with paginated results; "data" holds the raw message rows
+        """
+        # One extra row tells whether there is another page, without a COUNT(*).
+        # Only the first driver page is read, so limit + 1 must stay within the
+        # session's fetch size (5000); the routes cap limit at 1000.
+        rows = await cassandra_client.execute_async(statement, params + (limit + 1,))
+        
+        messages = rows[:limit]
+        has_more = len(rows) > limit
         
         return {
-            "total": total,
-            "page": page,
+            "has_more": has_more,
             "limit": limit,
-            "data": formatted_messages
+            "next_before_id": messages[-1]["message_id"] if has_more else None,
+            "data": messages
         }
 
 
@@ -255,7 +288,7 @@ class ConversationModel:
     @staticmethod
     async def get_user_conversations(
         user_id: int,
-        page: int = 1,
+        paging_state: Optional[bytes] = None,
         limit: int = 20
     ) -> Dict[str, Any]:
         """
@@ -263,52 +296,36 @@ class ConversationModel:
         
         Args:
             user_id: ID of the user
-            page: Page number (1-indexed)
+            paging_state: Driver paging state of the page to fetch (None for the first page)
             limit: Maximum number of conversations per page
             
         Returns:
             Dictionary with paginated conversations
         """
-        # Calculate pagination offset
-        offset = (page - 1) * limit
-        
-        # Query for conversations
-        query = """
-            SELECT conversation_id, other_user_id, last_message_at, last_message_content
-            FROM conversations_by_user
-            WHERE user_id = %s
-            LIMIT %s
-        """
+        # Query for conversations; the page size is driven by fetch_size, not LIMIT.
+        # The participants are denormalized into conversations_by_user, so the
+        # whole page comes from this one partition read.
+        conversations_raw, next_paging_state = await cassandra_client.execute_page(
+            _prepared_statements().select_convs_by_user, (user_id,),
+            fetch_size=limit, paging_state=paging_state
+        )
         
-        result = cassandra_client.execute(query, (user_id, limit + offset))
-        
-        # Apply offset and limit
-        conversations_raw = result[offset:offset+limit]
-        
-        # Get detailed conversation information
-        conversations = []
-        for conv_raw in conversations_raw:
-            # Get the full conversation details
-            conv_details = await ConversationModel.get_conversation(conv_raw["conversation_id"])
-            if conv_details:
-                # Add last message details
-                conv_details["last_message_at"] = conv_raw["last_message_at"]
-                conv_details["last_message_content"] = conv_raw["last_message_content"]
-                conversations.append(conv_details)
-        
-        # Count query
-        count_query = """
-            SELECT COUNT(*) as total
-            FROM conversations_by_user
-            WHERE user_id = %s
-        """
-        count_result = cassandra_client.execute(count_query, (user_id,))
-        total = count_result[0]["total"] if count_result else 0
+        conversations = [
+            {
+                "id": conv["conversation_id"],
+                "user1_id": conv["user1_id"],
+                "user2_id": conv["user2_id"],
+                "created_at": conv["conv_created_at"],
+                "last_message_at": conv["last_message_at"],
+                "last_message_content": conv["last_message_content"]
+            }
+            for conv in conversations_raw
+        ]
         
         return {
-            "total": total,
-            "page": page,
+            "has_more": next_paging_state is not None,
             "limit": limit,
+            "next_paging_state": next_paging_state,
             "data": conversations
         }
     
@@ -324,19 +341,12 @@ class ConversationModel:
             Dictionary with conversation details or None if not found
         """
         # Get conversation details, including last message info in a single query
-        query = """
-            SELECT conversation_id, user1_id, user2_id, created_at, last_message_at, last_message_content
-            FROM conversations
-            WHERE conversation_id = %s
-        """
-        
-        result = cassandra_client.execute(query, (conversation_id,))
+        result = await cassandra_client.execute_async(_prepared_statements().select_conv, (conversation_id,))
         
         if not result:
             return None
         
         conversation = result[0]
-        print(conversation["last_message_content"])
         
         # Return conversation with last message details
         return {
@@ -354,6 +364,9 @@ class ConversationModel:
         Get an existing conversation between two users or create a new one.
         
         This ensures we don't create duplicate conversations between the same users.
+        Resolved conversations are cached in-process, so repeat calls for the
+        same pair do not touch Cassandra. The cached dictionary is returned
+        as-is and updated by MessageModel.create_message.
         
         Args:
             user1_id: ID of the first user
@@ -366,54 +379,199 @@ class ConversationModel:
         lower_id = min(user1_id, user2_id)
         higher_id = max(user1_id, user2_id)
         
-        # Check if conversation already exists
-        # We need to use ALLOW FILTERING here since we're querying by user IDs
-        # In a production system, you might use a secondary index or a materialized view
-        query = """
-            SELECT conversation_id, user1_id, user2_id, created_at, last_message_at, last_message_content
-            FROM conversations
-            WHERE user1_id = %s AND user2_id = %s
-            ALLOW FILTERING
+        cache_key = (lower_id, higher_id)
+        conversation = _conversation_cache.get(cache_key)
+        if conversation is not None:
+            _conversation_cache.move_to_end(cache_key)
+            return conversation
+        
+        conversation = await ConversationModel._fetch_or_create_conversation(lower_id, higher_id)
+        
+        # Concurrent misses for the same pair each fetch their own copy; keep
+        # whichever was published first, so every caller shares one dictionary
+        conversation = _conversation_cache.setdefault(cache_key, conversation)
+        _conversation_cache.move_to_end(cache_key)
+        if len(_conversation_cache) > CONVERSATION_CACHE_SIZE:
+            _conversation_cache.popitem(last=False)
+        
+        return conversation
+    
+    @staticmethod
+    def forget_conversation(user1_id: int, user2_id: int) -> None:
         """
+        Drop a conversation from the in-process cache.
         
-        result = cassandra_client.execute(query, (lower_id, higher_id))
-        
-        if result:
-            # Return existing conversation
-            conversation = result[0]
-            return {
-                "id": conversation["conversation_id"],
-                "user1_id": conversation["user1_id"],
-                "user2_id": conversation["user2_id"],
-                "created_at": conversation["created_at"],
-                "last_message_at": conversation["last_message_at"],
-                "last_message_content": conversation["last_message_content"]
-            }
-        else:
-            # Create new conversation
-            now = datetime.now()
+        Args:
+            user1_id: ID of the first user
+            user2_id: ID of the second user
+        """
+        _conversation_cache.pop((min(user1_id, user2_id), max(user1_id, user2_id)), None)
+    
+    @staticmethod
+    async def _fetch_or_create_conversation(lower_id: int, higher_id: int) -> Dict[str, Any]:
+        """
+        Read the conversation for a sorted user pair from Cassandra, creating it if missing.
+        
+        Args:
+            lower_id: The lower of the two user IDs
+            higher_id: The higher of the two user IDs
             
-            # For simplicity, we'll generate a conversation ID from user IDs and timestamp
-            # This is just for demonstration; in production use a better ID strategy
-            conversation_id = abs(hash(f"{lower_id}:{higher_id}:{now.timestamp()}") % 100000000)
-                
-            # Insert new conversation with empty last message fields
-            insert_query = """
-                INSERT INTO conversations
-                (conversation_id, user1_id, user2_id, created_at, last_message_at, last_message_content)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """
+        Returns:
+            Dictionary with conversation details
+        """
+        # The conversation ID is derived from the participants, so the
+        # conversation is found by primary key instead of a filtering scan
+        conversation_id = ConversationModel.conversation_id_for(lower_id, higher_id)
+        
+        statements = _prepared_statements()
+        
+        # Check if conversation already exists
+        result = await cassandra_client.execute_async(statements.select_conv, (conversation_id,))
+        
+        if not result:
+            # Create new conversation; IF NOT EXISTS makes concurrent creators
+            # of the same conversation agree on a single row
+            now = datetime.now()
             
-            cassandra_client.execute(insert_query, 
-                (conversation_id, lower_id, higher_id, now, None, None)
+            result = await cassandra_client.execute_async(statements.insert_conv, 
+                (conversation_id, lower_id, higher_id, now)
             )
             
-            # Return the newly created conversation
-            return {
-                "id": conversation_id,
-                "user1_id": lower_id,
-                "user2_id": higher_id,
-                "created_at": now,
-                "last_message_at": None,
-                "last_message_content": None
-            }
\ No newline at end of file
+            if result[0]["[applied]"]:
+                # Return the newly created conversation
+                return {
+                    "id": conversation_id,
+                    "user1_id": lower_id,
+                    "user2_id": higher_id,
+                    "created_at": now,
+                    "last_message_at": None,
+                    "last_message_content": None
+                }
+            # Otherwise another request created it first, and the insert
+            # result carries the existing row
+        
+        # Return existing conversation
+        conversation = result[0]
+        return {
+            "id": conversation["conversation_id"],
+            "user1_id": conversation["user1_id"],
+            "user2_id": conversation["user2_id"],
+            "created_at": conversation["created_at"],
+            "last_message_at": conversation["last_message_at"],
+            "last_message_content": conversation["last_message_content"]
+        }
+    
+    @staticmethod
+    def conversation_id_for(user1_id: int, user2_id: int) -> int:
+        """
+        Derive the conversation ID for a pair of users.
+        
+        The lower user ID fills the high 32 bits and the higher ID the low
+        32 bits, so every pair of positive INT user IDs maps to exactly one
+        BIGINT without collisions. Negative IDs would sign-extend over the
+        high bits, which is why MessageCreate only accepts IDs of 1 and up.
+        
+        Args:
+            user1_id: ID of the first user
+            user2_id: ID of the second user
+            
+        Returns:
+            Conversation ID shared by both users
+        """
+        lower_id = min(user1_id, user2_id)
+        higher_id = max(user1_id, user2_id)
+        return (lower_id << 32) | higher_id
+
+
+# Prepared statements, created at application startup since preparing needs a
+# live session. Binding a prepared statement sends only its ID and the values,
+# so the coordinator does not re-parse the CQL on every call.
+_PS: Optional[SimpleNamespace] = None
+
+def prepare_statements() -> SimpleNamespace:
+    """
+    Prepare all model statements and publish them for the models to use.
+    
+    Called from the application's startup event, so the prepare round trips
+    do not block the event loop while serving a request. The statements are
+    only published once all of them are prepared; if one fails (e.g. a table
+    from an older schema is missing a column), nothing is half-initialised
+    and the next call prepares them again.
+    
+    Returns:
+        Namespace holding the prepared statements
+    """
+    global _PS
+    session = cassandra_client.get_session()
+    statements = SimpleNamespace(
+        insert_msg=session.prepare("""
+            INSERT INTO messages 
+            (conversation_id, message_id, sender_id, receiver_id, content, created_at) 
+            VALUES (?, ?, ?, ?, ?, ?)
+        """),
+        select_msgs=session.prepare("""
+            SELECT message_id, sender_id, receiver_id, content, created_at, conversation_id 
+            FROM messages 
+            WHERE conversation_id = ?
+            LIMIT ?
+        """),
+        select_all_msgs=session.prepare("""
+            SELECT message_id, sender_id, receiver_id, content, created_at, conversation_id 
+            FROM messages 
+            WHERE conversation_id = ?
+        """),
+        select_msgs_before_id=session.prepare("""
+            SELECT message_id, sender_id, receiver_id, content, created_at, conversation_id 
+            FROM messages 
+            WHERE conversation_id = ? AND message_id < ?
+            LIMIT ?
+        """),
+        select_msgs_before_time=session.prepare("""
+            SELECT message_id, sender_id, receiver_id, content, created_at, conversation_id 
+            FROM messages 
+            WHERE conversation_id = ? AND message_id < minTimeuuid(?)
+            LIMIT ?
+        """),
+        update_conv=session.prepare("""
+            UPDATE conversations
+            SET last_message_at = ?, last_message_content = ?
+            WHERE conversation_id = ?
+        """),
+        upsert_conv_by_user=session.prepare("""
+            INSERT INTO conversations_by_user 
+            (user_id, conversation_id, other_user_id, user1_id, user2_id, conv_created_at,
+             last_message_at, last_message_content) 
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            USING TIMESTAMP ?
+        """),
+        delete_conv_by_user=session.prepare("""
+            DELETE FROM conversations_by_user
+            USING TIMESTAMP ?
+            WHERE user_id = ? AND last_message_at = ? AND conversation_id = ?
+        """),
+        select_convs_by_user=session.prepare("""
+            SELECT conversation_id, user1_id, user2_id, conv_created_at,
+                   last_message_at, last_message_content
+            FROM conversations_by_user
+            WHERE user_id = ?
+        """),
+        select_conv=session.prepare("""
+            SELECT conversation_id, user1_id, user2_id, created_at, last_message_at, last_message_content
+            FROM conversations
+            WHERE conversation_id = ?
+        """),
+        insert_conv=session.prepare("""
+            INSERT INTO conversations
+            (conversation_id, user1_id, user2_id, created_at)
+            VALUES (?, ?, ?, ?)
+            IF NOT EXISTS
+        """)
+    )
+    _PS = statements
+    return statements
+
+def _prepared_statements() -> SimpleNamespace:
+    """Return the prepared statements, preparing them if startup has not."""
+    if _PS is None:
+        return prepare_statements()
+    return _PS
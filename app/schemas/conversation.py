@@ -14,11 +14,11 @@ class ConversationDetail(ConversationResponse):
     messages: List[MessageResponse] = Field(..., description="List of messages in conversation")
 
 class PaginatedConversationRequest(BaseModel):
-    page: int = Field(1, description="Page number for pagination")
-    limit: int = Field(20, description="Number of items per page")
+    before_token: Optional[str] = Field(None, description="Page token returned by the previous page")
+    limit: int = Field(20, ge=1, le=1000, description="Number of items per page")
 
 class PaginatedConversationResponse(BaseModel):
-    total: int = Field(..., description="Total number of conversations")
-    page: int = Field(..., description="Current page number")
+    has_more: bool = Field(..., description="Whether more conversations are available")
     limit: int = Field(..., description="Number of items per page")
+    next_page_token: Optional[str] = Field(None, description="Token for fetching the next page, if any")
     data: List[ConversationResponse] = Field(..., description="List of conversations") 
\ No newline at end of file
@@ -1,3 +1,5 @@
+import uuid
+import msgspec
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
@@ -5,9 +7,13 @@ from datetime import datetime
 class MessageBase(BaseModel):
     content: str = Field(..., description="Content of the message")
 
+# User IDs are stored as Cassandra INT, and conversation IDs pack two of them
+# into a BIGINT, which is only collision-free for positive 32-bit IDs
+MAX_USER_ID = 2**31 - 1
+
 class MessageCreate(MessageBase):
-    sender_id: int = Field(..., description="ID of the sender")
-    receiver_id: int = Field(..., description="ID of the receiver")
+    sender_id: int = Field(..., ge=1, le=MAX_USER_ID, description="ID of the sender")
+    receiver_id: int = Field(..., ge=1, le=MAX_USER_ID, description="ID of the receiver")
 
 class MessageResponse(MessageBase):
     id: str = Field(..., description="Unique ID of the message as UUID string")
@@ -17,12 +23,31 @@ class MessageResponse(MessageBase):
     conversation_id: int = Field(..., description="ID of the conversation")
 
 class PaginatedMessageRequest(BaseModel):
-    page: int = Field(1, description="Page number for pagination")
-    limit: int = Field(20, description="Number of items per page")
+    before_token: Optional[str] = Field(None, description="Page token returned by the previous page")
+    limit: int = Field(20, ge=1, le=1000, description="Number of items per page")
     before_timestamp: Optional[datetime] = Field(None, description="Get messages before this timestamp")
 
 class PaginatedMessageResponse(BaseModel):
-    total: int = Field(..., description="Total number of messages")
-    page: int = Field(..., description="Current page number")
+    has_more: bool = Field(..., description="Whether more messages are available")
     limit: int = Field(..., description="Number of items per page")
-    data: List[MessageResponse] = Field(..., description="List of messages") 
\ No newline at end of file
+    next_page_token: Optional[str] = Field(None, description="Token for fetching the next page, if any")
+    data: List[MessageResponse] = Field(..., description="List of messages") 
+
+# msgspec mirrors of the paginated message responses. These are built per row
+# on the list endpoints, where they construct and encode much faster than the
+# Pydantic models; the Pydantic models above remain the documented schema.
+class MessageStruct(msgspec.Struct):
+    content: str
+    # Kept as a UUID: msgspec writes the canonical string form in C, which is
+    # cheaper than str() per row
+    id: uuid.UUID
+    sender_id: int
+    receiver_id: int
+    created_at: datetime
+    conversation_id: int
+
+class PaginatedMessageStruct(msgspec.Struct):
+    has_more: bool
+    limit: int
+    next_page_token: Optional[str]
+    data: List[MessageStruct]
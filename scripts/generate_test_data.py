@@ -3,11 +3,13 @@ Script to generate test data for the Messenger application.
 This script generates users, conversations between users, and messages within conversations.
 """
 import os
-import uuid
 import logging
 import random
 from datetime import datetime, timedelta
-from cassandra.cluster import Cluster
+from cassandra.cluster import Cluster, ExecutionProfile, EXEC_PROFILE_DEFAULT
+from cassandra.policies import TokenAwarePolicy, DCAwareRoundRobinPolicy
+from cassandra.query import BatchStatement, BatchType
+from cassandra.util import uuid_from_time
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -22,11 +24,43 @@ NUM_USERS = 10  # Number of users to create
 NUM_CONVERSATIONS = 15  # Number of conversations to create
 MAX_MESSAGES_PER_CONVERSATION = 50  # Maximum number of messages per conversation
 
+# Sample message contents to pick from
+MESSAGE_SAMPLES = (
+    "Hey, how are you?", "What's up?", "I'm good, thanks!", 
+    "Did you see the new movie?", "Let's grab coffee sometime.",
+    "Are you free this weekend?", "I'll get back to you soon.",
+    "Can you help me with something?", "Have a great day!",
+    "Sorry, I was busy.", "Sure thing!", "Maybe later?",
+    "That's awesome!", "I don't think so.", "Absolutely!",
+    "That's interesting.", "I'll be there.", "Don't worry about it.",
+    "Thanks for the update!", "Let me check and get back to you.", 
+    "Sounds like a plan!", "Good idea!", "I miss you!",
+    "Just checking in.", "See you soon!", "Call me when you can.",
+    "What time works for you?", "I'm running late.", "No problem!",
+    "Let me know what you think.", "Can't wait!", "That's hilarious!",
+    "Good morning!", "Good night!", "Have a nice weekend!",
+    "Happy birthday!", "Congratulations!", "I'm sorry to hear that.",
+    "That's great news!", "I'm excited!", "Let's do this again sometime.",
+    "What do you think?", "I agree with you.", "That's amazing!",
+    "I'll be right back.", "Take your time.", "I understand.",
+    "No worries!", "Perfect!", "Sounds good!"
+)
+
 def connect_to_cassandra():
     """Connect to Cassandra cluster."""
     logger.info("Connecting to Cassandra...")
     try:
-        cluster = Cluster([CASSANDRA_HOST])
+        # Token-aware routing sends each insert straight to a replica, saving
+        # a coordinator hop. With protocol v4 each connection already carries
+        # thousands of concurrent requests, so the pool size is left alone.
+        profile = ExecutionProfile(
+            load_balancing_policy=TokenAwarePolicy(DCAwareRoundRobinPolicy())
+        )
+        cluster = Cluster(
+            [CASSANDRA_HOST],
+            protocol_version=4,
+            execution_profiles={EXEC_PROFILE_DEFAULT: profile}
+        )
         session = cluster.connect(CASSANDRA_KEYSPACE)
         logger.info("Connected to Cassandra!")
         return cluster, session
@@ -43,9 +77,38 @@ def generate_conversation_id(user1_id, user2_id):
     lower_id = min(user1_id, user2_id)
     higher_id = max(user1_id, user2_id)
     
-    # Generate conversation ID based on user IDs
-    conversation_id = abs(hash(f"{lower_id}:{higher_id}") % 100000000)
-    return conversation_id
+    # Pack the pair into one BIGINT; must match ConversationModel.conversation_id_for
+    # so the API reuses these conversations instead of creating new ones
+    return (lower_id << 32) | higher_id
+
+# Maximum number of statements per single-partition batch
+MAX_BATCH_SIZE = 100
+
+def submit_writes(session, same_partition_group, cross_partition_group):
+    """
+    Submit writes and wait for all of them to complete.
+    
+    same_partition_group is a (statement, params_list) pair whose rows all
+    share one partition; they are sent as UNLOGGED batches of at most
+    MAX_BATCH_SIZE statements, which a single replica set applies in one go.
+    cross_partition_group is a list of (statement, params) pairs touching
+    different partitions; each is sent as its own request, never batched,
+    so no coordinator has to fan a batch out across replicas.
+    """
+    statement, params_list = same_partition_group
+    futures = []
+    
+    for start in range(0, len(params_list), MAX_BATCH_SIZE):
+        batch = BatchStatement(batch_type=BatchType.UNLOGGED)
+        for params in params_list[start:start + MAX_BATCH_SIZE]:
+            batch.add(statement, params)
+        futures.append(session.execute_async(batch))
+    
+    for statement, params in cross_partition_group:
+        futures.append(session.execute_async(statement, params))
+    
+    for future in futures:
+        future.result()
 
 def generate_test_data(session):
     """
@@ -58,6 +121,31 @@ def generate_test_data(session):
     """
     logger.info("Generating test data...")
     
+    # Prepare each statement once; every row below only binds values
+    insert_conv = session.prepare("""
+        INSERT INTO conversations
+        (conversation_id, user1_id, user2_id, created_at, last_message_at, last_message_content)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """)
+    insert_msg = session.prepare("""
+        INSERT INTO messages 
+        (conversation_id, message_id, sender_id, receiver_id, content, created_at) 
+        VALUES (?, ?, ?, ?, ?, ?)
+    """)
+    update_conv = session.prepare("""
+        UPDATE conversations
+        SET last_message_at = ?, last_message_content = ?
+        WHERE conversation_id = ?
+    """)
+    insert_conv_by_user = session.prepare("""
+        INSERT INTO conversations_by_user 
+        (user_id, conversation_id, other_user_id, user1_id, user2_id, conv_created_at,
+         last_message_at, last_message_content) 
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """)
+    
+    now = datetime.now()
+    
     # 1. Create a set of user IDs (1 to NUM_USERS)
     user_ids = list(range(1,NUM_USERS+1))
     logger.info(f"Created {len(user_ids)} users with IDs from 1 to {NUM_USERS}")
@@ -69,8 +157,7 @@ def generate_test_data(session):
     # Create NUM_CONVERSATIONS random conversations
     while len(conversations) < NUM_CONVERSATIONS:
         # Pick two different random users
-        user1_id = random.choice(user_ids)
-        user2_id = random.choice([u for u in user_ids if u != user1_id])
+        user1_id, user2_id = random.sample(user_ids, 2)
         
         # Ensure this pair doesn't already have a conversation
         user_pair = (min(user1_id, user2_id), max(user1_id, user2_id))
@@ -88,7 +175,7 @@ def generate_test_data(session):
             'id': conversation_id,
             'user1_id': min(user1_id, user2_id),
             'user2_id': max(user1_id, user2_id),
-            'created_at': datetime.now() - timedelta(days=random.randint(1, 30))
+            'created_at': now - timedelta(days=random.randint(1, 30))
         })
     
     logger.info(f"Generated {len(conversations)} conversations")
@@ -96,12 +183,7 @@ def generate_test_data(session):
     # 3. Insert conversations into Cassandra tables
     for conversation in conversations:
         # Insert into conversations table
-        conversation_query = """
-            INSERT INTO conversations
-            (conversation_id, user1_id, user2_id, created_at, last_message_at, last_message_content)
-            VALUES (%s, %s, %s, %s, %s, %s)
-        """
-        session.execute(conversation_query, (
+        session.execute(insert_conv, (
             conversation['id'], 
             conversation['user1_id'], 
             conversation['user2_id'], 
@@ -112,82 +194,39 @@ def generate_test_data(session):
     
     # 4. For each conversation, generate a random number of messages
     message_count = 0
-    message_samples = [
-        "Hey, how are you?", "What's up?", "I'm good, thanks!", 
-        "Did you see the new movie?", "Let's grab coffee sometime.",
-        "Are you free this weekend?", "I'll get back to you soon.",
-        "Can you help me with something?", "Have a great day!",
-        "Sorry, I was busy.", "Sure thing!", "Maybe later?",
-        "That's awesome!", "I don't think so.", "Absolutely!",
-        "That's interesting.", "I'll be there.", "Don't worry about it.",
-        "Thanks for the update!", "Let me check and get back to you.", 
-        "Sounds like a plan!", "Good idea!", "I miss you!",
-        "Just checking in.", "See you soon!", "Call me when you can.",
-        "What time works for you?", "I'm running late.", "No problem!",
-        "Let me know what you think.", "Can't wait!", "That's hilarious!",
-        "Good morning!", "Good night!", "Have a nice weekend!",
-        "Happy birthday!", "Congratulations!", "I'm sorry to hear that.",
-        "That's great news!", "I'm excited!", "Let's do this again sometime.",
-        "What do you think?", "I agree with you.", "That's amazing!",
-        "I'll be right back.", "Take your time.", "I understand.",
-        "No worries!", "Perfect!", "Sounds good!"
-    ]
     
     for conversation in conversations:
         # Decide how many messages this conversation will have
         num_messages = random.randint(3, MAX_MESSAGES_PER_CONVERSATION)
         
-        # Track the most recent message for updating conversation metadata
-        latest_message_time = None
-        latest_message_content = None
-        
-        # Generate messages with timestamps in ascending order
-        message_timestamps = []
+        # Generate message timestamps spread uniformly between the conversation's
+        # creation and the recent past, in ascending order
         start_time = conversation['created_at']
-        end_time = datetime.now() - timedelta(minutes=random.randint(5, 60))
+        end_time = now - timedelta(minutes=random.randint(5, 60))
+        span = (end_time - start_time).total_seconds()
         
-        for i in range(num_messages):
-            # Create a realistic progression of timestamps
-            if i == 0:
-                timestamp = start_time + timedelta(minutes=random.randint(5, 30))
-            elif i == num_messages - 1:
-                timestamp = end_time
-            else:
-                # Distribute messages between start and end
-                progress = i / (num_messages - 1)
-                time_range = (end_time - start_time).total_seconds()
-                seconds_from_start = time_range * progress
-                variation = random.uniform(-0.1, 0.1) * time_range  # Add some randomness
-                timestamp = start_time + timedelta(seconds=seconds_from_start + variation)
-            
-            message_timestamps.append(timestamp)
+        message_timestamps = [
+            start_time + timedelta(seconds=offset)
+            for offset in sorted(random.uniform(0, span) for _ in range(num_messages))
+        ]
         
-        # Sort timestamps to ensure chronological order
-        message_timestamps.sort()
+        # Decide who sends each message and what it says
+        user1_id, user2_id = conversation['user1_id'], conversation['user2_id']
+        senders = random.choices((user1_id, user2_id), k=num_messages)
+        contents = random.choices(MESSAGE_SAMPLES, k=num_messages)
         
-        # Generate and insert messages
-        for i, timestamp in enumerate(message_timestamps):
-            # Decide who sends this message
-            if random.random() < 0.5:
-                sender_id = conversation['user1_id']
-                receiver_id = conversation['user2_id']
-            else:
-                sender_id = conversation['user2_id']
-                receiver_id = conversation['user1_id']
-            
-            # Generate message content
-            content = random.choice(message_samples)
-            
-            # Generate TimeUUID for the message
-            message_id = uuid.uuid1()
+        # Generate TimeUUIDs from the timestamps, since messages are clustered
+        # (and queried by time) on message_id; sorted timestamps give ascending IDs
+        message_ids = [uuid_from_time(timestamp) for timestamp in message_timestamps]
+        
+        # Generate the message rows; they all land in the conversation's partition
+        message_params = []
+        for message_id, timestamp, sender_id, content in zip(
+            message_ids, message_timestamps, senders, contents
+        ):
+            receiver_id = user2_id if sender_id == user1_id else user1_id
             
-            # Insert the message
-            message_query = """
-                INSERT INTO messages 
-                (conversation_id, message_id, sender_id, receiver_id, content, created_at) 
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            session.execute(message_query, (
+            message_params.append((
                 conversation['id'],
                 message_id,
                 sender_id,
@@ -195,45 +234,45 @@ def generate_test_data(session):
                 content,
                 timestamp
             ))
-            
-            message_count += 1
-            
-            # Keep track of the latest message for updating conversation metadata
-            if latest_message_time is None or timestamp > latest_message_time:
-                latest_message_time = timestamp
-                latest_message_content = content
         
-        # Update conversations table with the latest message details
-        update_conv_query = """
-            UPDATE conversations
-            SET last_message_at = %s, last_message_content = %s
-            WHERE conversation_id = %s
-        """
-        session.execute(update_conv_query, (
-            latest_message_time, 
-            latest_message_content, 
-            conversation['id']
-        ))
+        message_count += num_messages
+        
+        # Timestamps are ascending, so the last message is the latest one
+        latest_message_time = message_timestamps[-1]
+        latest_message_content = contents[-1]
         
-        # Update conversations_by_user for both users
+        # Update the conversations row and both users' conversations_by_user
+        # rows alongside the messages; they live in different partitions, so
+        # they are sent as independent requests rather than batched
+        conversation_updates = [
+            (update_conv, (
+                latest_message_time, 
+                latest_message_content, 
+                conversation['id']
+            ))
+        ]
         for user_id, other_user_id in [
             (conversation['user1_id'], conversation['user2_id']),
             (conversation['user2_id'], conversation['user1_id'])
         ]:
-            user_conv_query = """
-                INSERT INTO conversations_by_user 
-                (user_id, conversation_id, other_user_id, last_message_at, last_message_content) 
-                VALUES (%s, %s, %s, %s, %s)
-            """
-            session.execute(user_conv_query, (
+            conversation_updates.append((insert_conv_by_user, (
                 user_id,
                 conversation['id'],
                 other_user_id,
+                conversation['user1_id'],
+                conversation['user2_id'],
+                conversation['created_at'],
                 latest_message_time,
                 latest_message_content
-            ))
-    logger.info(f"These are the all conversation_ids : {[conv['id'] for conv in conversations]}")
-    logger.info(f"These are all the conversation users pairs : {[(conv['user1_id'], conv['user2_id']) for conv in conversations]}")
+            )))
+        submit_writes(session, (insert_msg, message_params), conversation_updates)
+    # The full ID lists only matter when debugging; skip building them otherwise
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Conversation IDs: %s", [conv['id'] for conv in conversations])
+        logger.debug(
+            "Conversation user pairs: %s",
+            [(conv['user1_id'], conv['user2_id']) for conv in conversations]
+        )
     logger.info(f"Generated {message_count} messages across {len(conversations)} conversations")
     logger.info(f"User IDs range from 1 to {NUM_USERS}")
     logger.info("Use these IDs for testing the API endpoints")
@@ -3,6 +3,7 @@ Script to initialize Cassandra keyspace and tables for the Messenger application
 """
 import os
 import time
+import socket
 import logging
 from cassandra.cluster import Cluster
 from cassandra.auth import PlainTextAuthProvider
@@ -15,20 +16,30 @@ CASSANDRA_HOST = os.getenv("CASSANDRA_HOST", "localhost")
 CASSANDRA_PORT = int(os.getenv("CASSANDRA_PORT", "9042"))
 CASSANDRA_KEYSPACE = os.getenv("CASSANDRA_KEYSPACE", "messenger")
 
+# Replication settings; the defaults match the single-node docker-compose cluster
+CASSANDRA_DC = os.getenv("CASSANDRA_DC", "datacenter1")
+CASSANDRA_RF = int(os.getenv("CASSANDRA_RF", "1"))
+
 def wait_for_cassandra():
     """Wait for Cassandra to be ready before proceeding."""
     logger.info("Waiting for Cassandra to be ready...")
-    cluster = None
     
-    for _ in range(10):  # Try 10 times
+    # Probe the native transport port, which is cheap compared to a full
+    # cluster connect, and back off exponentially between attempts
+    max_attempts = 10
+    for attempt in range(max_attempts):
         try:
-            cluster = Cluster([CASSANDRA_HOST])
-            session = cluster.connect()
-            logger.info("Cassandra is ready!")
-            return cluster
-        except Exception as e:
-            logger.warning(f"Cassandra not ready yet: {str(e)}")
-            time.sleep(5)  # Wait 5 seconds before trying again
+            with socket.create_connection((CASSANDRA_HOST, CASSANDRA_PORT), timeout=1):
+                logger.info("Cassandra is ready!")
+                return Cluster([CASSANDRA_HOST], port=CASSANDRA_PORT)
+        except OSError as e:
+            if attempt == max_attempts - 1:
+                # Last attempt; fail right away instead of sleeping first
+                logger.warning(f"Cassandra not ready yet: {str(e)}")
+                break
+            delay = min(30, 0.5 * 2 ** attempt)
+            logger.warning(f"Cassandra not ready yet: {str(e)}; retrying in {delay}s")
+            time.sleep(delay)
     
     logger.error("Failed to connect to Cassandra after multiple attempts.")
     raise Exception("Could not connect to Cassandra")
@@ -44,11 +55,14 @@ def create_keyspace(session):
     # TODO: Students should implement keyspace creation
     # Hint: Consider replication strategy and factor for a distributed database
     
+    # NetworkTopologyStrategy keeps the same keyspace definition valid for a
+    # multi-datacenter production cluster; the replication factor should not
+    # exceed the number of nodes in the datacenter
     session.execute(f"""
         CREATE KEYSPACE IF NOT EXISTS {CASSANDRA_KEYSPACE}
         WITH REPLICATION = {{
-            'class': 'SimpleStrategy',
-            'replication_factor': 3
+            'class': 'NetworkTopologyStrategy',
+            '{CASSANDRA_DC}': {CASSANDRA_RF}
         }}
     """)
     
@@ -68,47 +82,57 @@ def create_tables(session):
     # - What should be the primary keys and clustering columns?
     # - How will you handle pagination and time-based queries?
     
+    # The tables are independent, so their DDL is submitted concurrently and
+    # the schema agreement waits overlap instead of running one after another
+    futures = []
+    
     # Messages Table - Stores all messages between users
-    # Using TIMEUUID for message_id for unique ID with timestamp
-    session.execute("""
+    # Using TIMEUUID for message_id for unique ID with timestamp; clustering on it
+    # lets time-based queries and pagination restrict the primary key directly
+    futures.append(session.execute_async("""
         CREATE TABLE IF NOT EXISTS messages (
-            conversation_id INT,
+            conversation_id BIGINT,
             message_id TIMEUUID,  
             sender_id INT,
             receiver_id INT,
             content TEXT,
             created_at TIMESTAMP,
-            PRIMARY KEY ((conversation_id), created_at, message_id)
-        ) WITH CLUSTERING ORDER BY (created_at DESC, message_id DESC);
-    """)
-    logger.info("Messages table created.")
+            PRIMARY KEY ((conversation_id), message_id)
+        ) WITH CLUSTERING ORDER BY (message_id DESC);
+    """))
     
     # Conversations by User Table - For retrieving all conversations of a user
-    session.execute("""
+    # Conversation participants and creation time are denormalized here so the
+    # conversation list does not need a lookup per row in the conversations table
+    futures.append(session.execute_async("""
         CREATE TABLE IF NOT EXISTS conversations_by_user (
             user_id INT,
-            conversation_id INT,
+            conversation_id BIGINT,
             other_user_id INT,
+            user1_id INT,
+            user2_id INT,
+            conv_created_at TIMESTAMP,
             last_message_at TIMESTAMP,
             last_message_content TEXT,
             PRIMARY KEY ((user_id), last_message_at, conversation_id)
         ) WITH CLUSTERING ORDER BY (last_message_at DESC, conversation_id ASC);
-    """)
-    logger.info("Conversations by user table created.")
+    """))
     
     # Conversation Details Table - For conversation metadata
     # Now includes last message details for efficient retrieval
-    session.execute("""
+    futures.append(session.execute_async("""
         CREATE TABLE IF NOT EXISTS conversations (
-            conversation_id INT PRIMARY KEY,
+            conversation_id BIGINT PRIMARY KEY,
             user1_id INT,
             user2_id INT,
             created_at TIMESTAMP,
             last_message_at TIMESTAMP,
             last_message_content TEXT
         );
-    """)
-    logger.info("Conversations table created.")
+    """))
+    
+    for future in futures:
+        future.result()
     
     logger.info("Tables created successfully.")
 